@@ -1,12 +1,18 @@
 # api_call_example.py
-from openai import OpenAI
+from openai import OpenAI, APITimeoutError
 import base64
 from pathlib import Path
 import json
+import time
+import threading
+import argparse
+from concurrent.futures import Future, wait, FIRST_COMPLETED
 from tqdm import tqdm
 import numpy as np
 from sklearn.metrics import confusion_matrix, classification_report
 
+from exemplar_index import ExemplarIndex, default_index_file
+
 PROMPT = """# Role: Thyroid Imaging Diagnostic Assistant
 ## Task:
 Analyze thyroid lymph node ultrasound images to classify them as **"diseased"** or **"normal"**.
@@ -29,6 +35,19 @@ Analyze thyroid lymph node ultrasound images to classify them as **"diseased"**
 }
 ```"""
 
+# 多图模式的系统提示，输出格式改为按图片标签列出的分类列表
+PACKED_PROMPT = PROMPT.split("## Output Format:")[0] + """## Output Format:
+```json
+{
+"results": [{"id": "image id", "classification": "diseased or normal"}]
+}
+```"""
+
+SINGLE_QUESTION = "<image>Does the thyroid have any diseases?"
+
+# 单图请求的模式，共用同一组耗时统计计算对冲阈值
+SINGLE_MODES = ("single", "fallback", "parity")
+
 def encode_image(image_path):
     """将图片转换为 base64 编码"""
     with open(image_path, "rb") as image_file:
@@ -68,73 +87,425 @@ def calculate_metrics(all_results):
     
     return metrics
 
-def evaluate_model(image_dir: str, output_file: str = '/root/medical/evaluation_results.json'):
+def load_exclude_list(exclude_file):
+    # 读取预检脚本生成的排除列表，每行一个文件名
+    if not exclude_file:
+        return set()
+    with open(exclude_file, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+def send_request(client, base64_images, question, timeout, system_prompt=PROMPT):
+    """发送一次分类请求，返回模型响应文本
+    Args:
+        client: OpenAI 客户端
+        base64_images: base64 编码的图片列表，与 question 中的 <image> 一一对应
+        question: 用户问题
+        timeout: 客户端超时时间（秒）
+        system_prompt: 系统提示
+    """
+    # 构造API请求消息
+    messages = [
+        {
+            "role": "system",
+            "content": system_prompt
+        },
+        {
+            "role": "user",
+            "content": question
+        }
+    ]
+    
+    # 构造完整的请求数据
+    request_data = {
+        "messages": messages,
+        "images": [f"data:image/png;base64,{base64_image}" for base64_image in base64_images]
+    }
+    
+    # 发送API请求
+    result = client.chat.completions.create(
+        model="/root/medical/qwen2_vl/",
+        messages=[{
+            "role": "user",
+            "content": json.dumps(request_data)
+        }],
+        max_tokens=1000,
+        timeout=timeout
+    )
+    
+    return result.choices[0].message.content
+
+def start_request(client, base64_images, question, timeout, system_prompt=PROMPT):
+    """在守护线程中发送请求，返回 Future
+    被放弃的请求无法中断，会继续运行到客户端超时；使用守护线程保证脚本退出时不等待它们
+    """
+    future = Future()
+    
+    def run():
+        try:
+            future.set_result(send_request(client, base64_images, question, timeout, system_prompt))
+        except Exception as e:
+            future.set_exception(e)
+    
+    threading.Thread(target=run, daemon=True).start()
+    return future
+
+def hedged_request(client, base64_images, question, deadline, hedge_delay=None, system_prompt=PROMPT):
+    """带截止时间的请求，超过 hedge_delay 后发送一个重复请求，先返回者胜出
+    Args:
+        client: OpenAI 客户端
+        base64_images: base64 编码的图片列表
+        question: 用户问题
+        deadline: 单次请求的截止时间（秒）
+        hedge_delay: 发送重复请求前的等待时间（秒），None 表示不对冲
+        system_prompt: 系统提示
+    Returns:
+        (response, info)，info 记录耗时、是否对冲、被放弃的请求数以及是否超过截止时间
+        失败时抛出的异常带有 request_info 属性，内容同 info
+    
+    截止时间只由等待 Future 控制，客户端默认的重试仍然生效，用于从短暂的连接错误中恢复
+    被放弃（abandoned）的请求不会被中断，会在客户端超时（含重试）后自行结束，服务端可能继续生成
+    """
+    start = time.monotonic()
+    futures = [start_request(client, base64_images, question, deadline, system_prompt)]
+    info = {"latency": None, "hedged": False, "abandoned": 0, "deadline_exceeded": False}
+    
+    # 等待主请求，超过对冲阈值后发送重复请求，其超时不超过剩余的截止时间
+    if hedge_delay is not None and hedge_delay < deadline:
+        done, _ = wait(futures, timeout=hedge_delay)
+        if not done:
+            remaining = deadline - (time.monotonic() - start)
+            futures.append(start_request(client, base64_images, question, remaining, system_prompt))
+            info["hedged"] = True
+    
+    # 取第一个成功返回的结果，直到截止时间
+    response = None
+    error = None
+    pending = set(futures)
+    while pending and response is None:
+        remaining = deadline - (time.monotonic() - start)
+        if remaining <= 0:
+            break
+        done, pending = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                response = future.result()
+                break
+            except Exception as e:
+                error = e
+    
+    info["latency"] = time.monotonic() - start
+    
+    # 仍未完成的请求直接放弃
+    info["abandoned"] = len(pending)
+    
+    if response is None:
+        # 客户端超时和等待超时都按超过截止时间处理
+        if pending or error is None or isinstance(error, APITimeoutError):
+            info["deadline_exceeded"] = True
+            info["latency"] = deadline
+        if error is None or pending:
+            error = TimeoutError(f"Request exceeded deadline of {deadline}s")
+        error.request_info = info
+        raise error
+    
+    return response, info
+
+def get_hedge_delay(request_log, modes, hedge_percentile, hedge_min_samples):
+    """根据同类请求（modes 中的模式）已成功请求的耗时分位数计算对冲阈值"""
+    if hedge_percentile is None:
+        return None
+    latencies = [r["latency"] for r in request_log
+                 if r["mode"] in modes and not r.get("failed") and r.get("latency") is not None]
+    if len(latencies) < hedge_min_samples:
+        return None
+    return float(np.percentile(latencies, hedge_percentile))
+
+def record_failure(request_log, mode, error):
+    """记录失败的请求，返回请求信息；请求未发出（如读取图片失败）时耗时为 None"""
+    info = getattr(error, "request_info", None) or {
+        "latency": None,
+        "hedged": False,
+        "abandoned": 0,
+        "deadline_exceeded": False
+    }
+    request_log.append({"mode": mode, "failed": True, **info})
+    return info
+
+def build_few_shot_question(exemplars):
+    """构造 few-shot 问题，示例图片带标签放在待分类图片之前"""
+    reference_lines = "\n".join(f"Reference image {i + 1} ({exemplar['label']}): <image>"
+                                for i, exemplar in enumerate(exemplars))
+    return f"""{reference_lines}
+The reference images above are labelled examples. Classify only the final image.
+{SINGLE_QUESTION}"""
+
+def classify_image(client, image_path, request_timeout, hedge_delay, request_log,
+                   mode="single", exemplars=None):
+    """单图模式：一张图片一次请求，exemplars 不为空时附带 few-shot 示例"""
+    true_label = "normal" if "-p0" in str(image_path).lower() else "diseased"
+    try:
+        base64_images = [encode_image(str(image_path))]
+        question = SINGLE_QUESTION
+        if exemplars:
+            base64_images = [encode_image(e["image_path"]) for e in exemplars] + base64_images
+            question = build_few_shot_question(exemplars)
+        response, info = hedged_request(client, base64_images, question,
+                                        request_timeout, hedge_delay)
+        request_log.append({"mode": mode, **info})
+        print(f"Image: {image_path}")
+        print(f"Response: {response}")
+        
+        result = {
+            "image_path": str(image_path),
+            "true_label": true_label,
+            "model_response": response,
+            "success": True,
+            **info
+        }
+        if exemplars:
+            result["exemplars"] = [e["image_path"] for e in exemplars]
+        return result
+        
+    except Exception as e:
+        print(f"Error processing {image_path}: {e}")
+        info = record_failure(request_log, mode, e)
+        return {
+            "image_path": str(image_path),
+            "true_label": true_label,
+            "model_response": f"Error: {str(e)}",
+            "success": False,
+            **info
+        }
+
+def build_packed_question(tags):
+    """构造多图请求的问题，每张图片带一个标签"""
+    image_lines = "\n".join(f"Image {tag}: <image>" for tag in tags)
+    example = ", ".join(f'{{"id": "{tag}", "classification": "diseased or normal"}}' for tag in tags)
+    return f"""{image_lines}
+Each image above is a separate case. Does the thyroid have any diseases in each image?
+Classify every image independently and answer with one entry per image id.
+## Output Format:
+```json
+{{
+"results": [{example}]
+}}
+```"""
+
+def parse_packed_response(response, tags):
+    """解析多图请求的响应，返回 {标签: 分类}，只保留合法的标签和分类"""
+    # 去掉 ```json 等包裹，只取最外层的 JSON 对象
+    start = response.find("{")
+    end = response.rfind("}")
+    if start == -1 or end == -1:
+        raise ValueError("No JSON object found in packed response")
+    data = json.loads(response[start:end + 1])
+    if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+        raise ValueError("Packed response has no results list")
+    
+    labels = {}
+    for item in data["results"]:
+        if not isinstance(item, dict):
+            continue
+        tag = str(item.get("id", ""))
+        classification = str(item.get("classification", "")).lower()
+        if tag in tags and classification in ("diseased", "normal"):
+            labels[tag] = classification
+    
+    if not labels:
+        raise ValueError("No valid classification found in packed response")
+    return labels
+
+def classify_pack(client, image_paths, request_timeout, hedge_delay, request_log):
+    """多图模式：一次请求发送多张图片，返回能解析出结果的图片预测
+    Returns:
+        {图片路径: 结果}，解析失败或缺失的图片不在其中，由调用方回退到单图模式
+    """
+    tags = [f"img{i + 1}" for i in range(len(image_paths))]
+    try:
+        base64_images = [encode_image(str(image_path)) for image_path in image_paths]
+        response, info = hedged_request(client, base64_images, build_packed_question(tags),
+                                        request_timeout, hedge_delay, system_prompt=PACKED_PROMPT)
+    except Exception as e:
+        print(f"Error processing pack starting at {image_paths[0]}: {e}")
+        record_failure(request_log, "packed", e)
+        return {}
+    
+    request_log.append({"mode": "packed", **info})
+    print(f"Pack: {[str(image_path) for image_path in image_paths]}")
+    print(f"Response: {response}")
+    
+    # 请求成功但响应无法解析时，不计为请求失败
+    try:
+        labels = parse_packed_response(response, tags)
+    except ValueError as e:
+        print(f"Error parsing pack starting at {image_paths[0]}: {e}")
+        return {}
+    
+    results = {}
+    for tag, image_path in zip(tags, image_paths):
+        if tag not in labels:
+            continue
+        results[image_path] = {
+            "image_path": str(image_path),
+            "true_label": "normal" if "-p0" in str(image_path).lower() else "diseased",
+            "model_response": json.dumps({"classification": labels[tag]}),
+            "success": True,
+            "packed": True,
+            "pack_size": len(image_paths),
+            "pack_tag": tag,
+            "pack_response": response
+        }
+    return results
+
+def extract_label(result):
+    """从单条结果中取出预测分类，解析失败返回 None"""
+    if not result["success"]:
+        return None
+    try:
+        return json.loads(result["model_response"]).get("classification", "").lower()
+    except Exception:
+        return None
+
+def compute_parity(packed_results, single_results):
+    """对比同一批图片在多图模式和单图模式下的准确率及一致率"""
+    pairs = []
+    for packed, single in zip(packed_results, single_results):
+        packed_label = extract_label(packed)
+        single_label = extract_label(single)
+        if packed_label is not None and single_label is not None:
+            pairs.append((packed["true_label"], packed_label, single_label))
+    
+    if not pairs:
+        return {"samples": 0}
+    return {
+        "samples": len(pairs),
+        "packed_accuracy": sum(t == p for t, p, _ in pairs) / len(pairs),
+        "single_accuracy": sum(t == s for t, _, s in pairs) / len(pairs),
+        "agreement": sum(p == s for _, p, s in pairs) / len(pairs)
+    }
+
+def _summarize_requests(requests):
+    latencies = [r["latency"] for r in requests if r.get("latency") is not None]
+    stats = {
+        "request_count": len(requests),
+        "hedged_count": sum(1 for r in requests if r.get("hedged")),
+        "abandoned_count": sum(r.get("abandoned", 0) for r in requests),
+        "deadline_exceeded_count": sum(1 for r in requests if r.get("deadline_exceeded"))
+    }
+    if latencies:
+        stats.update({
+            "p50": float(np.percentile(latencies, 50)),
+            "p95": float(np.percentile(latencies, 95)),
+            "p99": float(np.percentile(latencies, 99)),
+            "max": float(max(latencies))
+        })
+    return stats
+
+def summarize_latency(request_log):
+    """统计请求数、对冲和放弃的请求数；耗时分位数按模式分别统计，不同模式的负载不可比"""
+    stats = _summarize_requests(request_log)
+    for key in ("p50", "p95", "p99", "max"):
+        stats.pop(key, None)
+    
+    modes = sorted({r["mode"] for r in request_log})
+    stats["by_mode"] = {
+        mode: _summarize_requests([r for r in request_log if r["mode"] == mode])
+        for mode in modes
+    }
+    return stats
+
+def evaluate_model(image_dir: str, output_file: str = '/root/medical/evaluation_results.json',
+                   exclude_file: str = None, request_timeout: float = 60.0,
+                   hedge_percentile: float = None, hedge_min_samples: int = 5,
+                   pack_size: int = 1, parity_samples: int = 0, limit: int = None,
+                   exemplar_dir: str = None, exemplar_index_file: str = None,
+                   few_shot_k: int = 0):
     """评估模型性能
     Args:
         image_dir: 图片目录路径
         output_file: 评估结果输出文件路径
+        exclude_file: preflight_check.py 生成的排除列表路径
+        request_timeout: 单次请求的截止时间（秒）
+        hedge_percentile: 对冲阈值的耗时分位数（如 95），None 表示不对冲
+        hedge_min_samples: 开始对冲前至少需要的成功请求数
+        pack_size: 每次请求打包的图片数量，1 表示单图模式
+        parity_samples: 多图模式下额外用单图模式复测的图片数量，用于对比准确率
+        limit: 最多评估的图片数量，None 表示全部
+        exemplar_dir: few-shot 示例图片目录
+        exemplar_index_file: 示例索引文件路径，存在且未过期时直接复用，默认为示例目录旁的 few_shot_index.npz
+        few_shot_k: 每张图片附带的最相似示例数量，0 表示不使用 few-shot，仅支持单图模式
     """
+    if few_shot_k > 0 and not exemplar_dir:
+        raise ValueError("few_shot_k > 0 requires exemplar_dir")
+    if few_shot_k > 0 and pack_size > 1:
+        raise ValueError("few-shot is only supported in single-image mode (pack_size == 1)")
+    
     client = OpenAI(
         api_key="0",
         base_url="http://0.0.0.0:8000/v1"
     )
     
-    image_paths = list(Path(image_dir).glob("*.png"))[:10]
+    excluded = load_exclude_list(exclude_file)
+    image_paths = [p for p in Path(image_dir).glob("*.png") if p.name not in excluded][:limit]
     all_results = []  # 存储所有结果
+    request_log = []  # 每次请求的耗时、对冲和放弃情况
+    packing = None
+    few_shot = None
+    exemplars = {}
     
-    # 顺序处理每张图片
-    for image_path in tqdm(image_paths, desc="Processing images"):
-        try:
-            true_label = "normal" if "-p0" in str(image_path).lower() else "diseased"
-            base64_image = encode_image(str(image_path))
-            
-            # 构造API请求消息
-            messages = [
-                {
-                    "role": "system",
-                    "content": PROMPT
-                },
-                {
-                    "role": "user",
-                    "content": "<image>Does the thyroid have any diseases?"
-                }
-            ]
-            
-            # 构造完整的请求数据
-            request_data = {
-                "messages": messages,
-                "images": [f"data:image/png;base64,{base64_image}"]
-            }
-            
-            # 发送API请求
-            result = client.chat.completions.create(
-                model="/root/medical/qwen2_vl/",
-                messages=[{
-                    "role": "user",
-                    "content": json.dumps(request_data)
-                }],
-                max_tokens=1000
-            )
-            
-            response = result.choices[0].message.content
-            print(f"Image: {image_path}")
-            print(f"Response: {response}")
-            
-            all_results.append({
-                "image_path": str(image_path),
-                "true_label": true_label,
-                "model_response": response,
-                "success": True
-            })
+    # 为所有图片一次性批量检索最相似的示例
+    if few_shot_k > 0:
+        index = ExemplarIndex.load_or_build(exemplar_dir,
+                                            exemplar_index_file or default_index_file(exemplar_dir))
+        start_time = time.monotonic()
+        exemplars = index.retrieve(image_paths, few_shot_k)
+        elapsed = time.monotonic() - start_time
+        few_shot = {
+            "k": few_shot_k,
+            "exemplar_count": len(index),
+            "retrieval_ms_per_image": 1000 * elapsed / max(1, len(image_paths))
+        }
+    
+    if pack_size > 1:
+        fallback_count = 0
+        for start in tqdm(range(0, len(image_paths), pack_size), desc="Processing packs"):
+            pack = image_paths[start:start + pack_size]
+            hedge_delay = get_hedge_delay(request_log, ("packed",), hedge_percentile, hedge_min_samples)
+            pack_results = classify_pack(client, pack, request_timeout, hedge_delay, request_log)
             
-        except Exception as e:
-            print(f"Error processing {image_path}: {e}")
-            all_results.append({
-                "image_path": str(image_path),
-                "true_label": true_label,
-                "model_response": f"Error: {str(e)}",
-                "success": False
-            })
+            # 解析失败的图片回退到单图模式
+            for image_path in pack:
+                if image_path in pack_results:
+                    all_results.append(pack_results[image_path])
+                else:
+                    fallback_count += 1
+                    hedge_delay = get_hedge_delay(request_log, SINGLE_MODES, hedge_percentile, hedge_min_samples)
+                    all_results.append(classify_image(client, image_path, request_timeout,
+                                                      hedge_delay, request_log, mode="fallback"))
+        
+        packing = {
+            "pack_size": pack_size,
+            "packed_images": sum(1 for r in all_results if r.get("packed")),
+            "fallback_images": fallback_count
+        }
+        
+        # 抽取部分多图结果，用单图模式复测以对比准确率
+        if parity_samples > 0:
+            packed_results = [r for r in all_results if r.get("packed")][:parity_samples]
+            single_results = []
+            for result in tqdm(packed_results, desc="Parity check"):
+                hedge_delay = get_hedge_delay(request_log, SINGLE_MODES, hedge_percentile, hedge_min_samples)
+                single_results.append(classify_image(client, Path(result["image_path"]),
+                                                     request_timeout, hedge_delay, request_log,
+                                                     mode="parity"))
+            packing["parity"] = compute_parity(packed_results, single_results)
+    else:
+        # 顺序处理每张图片
+        for image_path in tqdm(image_paths, desc="Processing images"):
+            hedge_delay = get_hedge_delay(request_log, SINGLE_MODES, hedge_percentile, hedge_min_samples)
+            all_results.append(classify_image(client, image_path, request_timeout,
+                                              hedge_delay, request_log,
+                                              exemplars=exemplars.get(str(image_path))))
     
     try:
         # 计算评估指标
@@ -143,8 +514,13 @@ def evaluate_model(image_dir: str, output_file: str = '/root/medical/evaluation_
         # 准备完整的评估结果
         evaluation_results = {
             "predictions": all_results,
-            "metrics": metrics
+            "metrics": metrics,
+            "latency": summarize_latency(request_log)
         }
+        if packing is not None:
+            evaluation_results["packing"] = packing
+        if few_shot is not None:
+            evaluation_results["few_shot"] = few_shot
         
         # 写入所有结果到JSON文件
         with open(output_file, 'w', encoding='utf-8') as f:
@@ -168,6 +544,27 @@ def evaluate_model(image_dir: str, output_file: str = '/root/medical/evaluation_
         print(f"\nAccuracy: {report['accuracy']:.3f}")
         print(f"Total samples: {metrics['total_samples']}")
         
+        latency = evaluation_results["latency"]
+        print("\n=== Request Latency ===")
+        for mode, mode_stats in latency["by_mode"].items():
+            line = f"{mode}: {mode_stats['request_count']} requests"
+            if "p50" in mode_stats:
+                line += f"  p50: {mode_stats['p50']:.2f}s  p95: {mode_stats['p95']:.2f}s  p99: {mode_stats['p99']:.2f}s  max: {mode_stats['max']:.2f}s"
+            print(line)
+        print(f"Requests: {latency['request_count']}  Hedged: {latency['hedged_count']}  Abandoned: {latency['abandoned_count']}  Deadline exceeded: {latency['deadline_exceeded_count']}")
+        
+        if packing is not None:
+            print("\n=== Request Packing ===")
+            print(f"Pack size: {packing['pack_size']}  Packed images: {packing['packed_images']}  Fallback images: {packing['fallback_images']}")
+            parity = packing.get("parity")
+            if parity and parity["samples"]:
+                print(f"Parity samples: {parity['samples']}")
+                print(f"Packed accuracy: {parity['packed_accuracy']:.3f}  Single accuracy: {parity['single_accuracy']:.3f}  Agreement: {parity['agreement']:.3f}")
+        
+        if few_shot is not None:
+            print("\n=== Few-shot ===")
+            print(f"k: {few_shot['k']}  Exemplars: {few_shot['exemplar_count']}  Retrieval: {few_shot['retrieval_ms_per_image']:.2f} ms/image")
+        
         # 验证文件是否写入成功
         with open(output_file, 'r', encoding='utf-8') as f:
             json.load(f)
@@ -177,7 +574,50 @@ def evaluate_model(image_dir: str, output_file: str = '/root/medical/evaluation_
         print(f"Error writing results: {e}")
         raise
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Evaluate the thyroid classification model')
+    parser.add_argument('--image_dir', type=str, default='/root/medical/medical_testset',
+                      help='Directory containing the test images')
+    parser.add_argument('--output_file', type=str, default='/root/medical/evaluation_results.json',
+                      help='Path of the output evaluation results JSON file')
+    parser.add_argument('--exclude_file', type=str, default=None,
+                      help='Exclusion list written by preflight_check.py')
+    parser.add_argument('--request_timeout', type=float, default=60.0,
+                      help='Deadline in seconds for each request')
+    parser.add_argument('--hedge_percentile', type=float, default=None,
+                      help='Send a duplicate request after this latency percentile (e.g. 95); disabled by default')
+    parser.add_argument('--hedge_min_samples', type=int, default=5,
+                      help='Successful requests needed before hedging starts')
+    parser.add_argument('--pack_size', type=int, default=1,
+                      help='Number of images packed into one request (1 = single-image mode)')
+    parser.add_argument('--parity_samples', type=int, default=0,
+                      help='Packed images re-run in single-image mode to compare accuracy')
+    parser.add_argument('--limit', type=int, default=None,
+                      help='Evaluate at most this many images (default: all)')
+    parser.add_argument('--exemplar_dir', type=str, default=None,
+                      help='Directory containing the labelled few-shot images')
+    parser.add_argument('--exemplar_index_file', type=str, default=None,
+                      help='Few-shot index file (default: few_shot_index.npz next to exemplar_dir)')
+    parser.add_argument('--few_shot_k', type=int, default=0,
+                      help='Number of nearest exemplars attached to each image (0 = zero-shot)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    evaluate_model(
+        args.image_dir,
+        args.output_file,
+        exclude_file=args.exclude_file,
+        request_timeout=args.request_timeout,
+        hedge_percentile=args.hedge_percentile,
+        hedge_min_samples=args.hedge_min_samples,
+        pack_size=args.pack_size,
+        parity_samples=args.parity_samples,
+        limit=args.limit,
+        exemplar_dir=args.exemplar_dir,
+        exemplar_index_file=args.exemplar_index_file,
+        few_shot_k=args.few_shot_k
+    )
+
 if __name__ == "__main__":
-    image_dir = "/root/medical/medical_testset"
-    output_file = "/root/medical/evaluation_results.json"
-    evaluate_model(image_dir, output_file)
\ No newline at end of file
+    main()
\ No newline at end of file
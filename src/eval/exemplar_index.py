@@ -0,0 +1,217 @@
+# python exemplar_index.py \
+# --exemplar_dir /root/thyroid/data/few_shot_data \
+# --index_file /root/thyroid/data/few_shot_index.npz
+
+import os
+from pathlib import Path
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+
+import numpy as np
+from PIL import Image
+
+# 特征参数，修改后已保存的索引会自动重建
+THUMBNAIL_SIZE = 32
+HISTOGRAM_BINS = 32
+FEATURE_VERSION = 1
+
+def default_index_file(exemplar_dir):
+    """默认索引路径：示例目录旁的 few_shot_index.npz"""
+    return str(Path(exemplar_dir).resolve().parent / "few_shot_index.npz")
+
+def get_label(image_path):
+    """与 eval.py 保持一致，文件名包含 -P0 为 normal"""
+    return "normal" if "-p0" in str(image_path).lower() else "diseased"
+
+def compute_embedding(image_path):
+    """计算图片的局部特征：灰度缩略图 + 灰度直方图，L2 归一化"""
+    with Image.open(image_path) as img:
+        gray = img.convert("L")
+        thumbnail = np.asarray(gray.resize((THUMBNAIL_SIZE, THUMBNAIL_SIZE), Image.BILINEAR),
+                               dtype=np.float32).ravel()
+        histogram = np.asarray(gray.histogram(), dtype=np.float32)
+
+    # 直方图合并到 HISTOGRAM_BINS 个区间
+    histogram = histogram.reshape(HISTOGRAM_BINS, -1).sum(axis=1)
+
+    # 缩略图去均值，使相似度关注结构而不是整体亮度
+    thumbnail -= thumbnail.mean()
+    blocks = []
+    for block in (thumbnail, histogram):
+        norm = np.linalg.norm(block)
+        blocks.append(block / norm if norm > 0 else block)
+
+    embedding = np.concatenate(blocks)
+    return embedding / np.linalg.norm(embedding)
+
+def _try_compute_embedding(image_path):
+    # 损坏的图片不应让整个批次失败，返回 None 由调用方跳过
+    try:
+        return compute_embedding(image_path)
+    except Exception as e:
+        print(f"Error computing embedding for {image_path}: {e}")
+        return None
+
+def compute_embeddings(image_paths, num_workers=None):
+    """使用进程池批量计算特征
+    Returns:
+        (embeddings, valid)，embeddings 为 (N, D) 的 float32 矩阵，无法读取的图片对应全零行，valid 标记成功的行
+    """
+    image_paths = [str(image_path) for image_path in image_paths]
+    dim = THUMBNAIL_SIZE * THUMBNAIL_SIZE + HISTOGRAM_BINS
+    if not image_paths:
+        return np.zeros((0, dim), dtype=np.float32), np.zeros(0, dtype=bool)
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        chunksize = max(1, len(image_paths) // ((num_workers or os.cpu_count() or 1) * 4))
+        embeddings = list(executor.map(_try_compute_embedding, image_paths, chunksize=chunksize))
+
+    valid = np.array([embedding is not None for embedding in embeddings])
+    embeddings = [embedding if embedding is not None else np.zeros(dim, dtype=np.float32)
+                  for embedding in embeddings]
+    return np.stack(embeddings).astype(np.float32), valid
+
+def _file_signature(image_paths):
+    # 用文件名、大小和修改时间判断索引是否过期
+    return np.array([f"{Path(p).name}:{os.path.getsize(p)}:{int(os.path.getmtime(p))}"
+                     for p in image_paths])
+
+class ExemplarIndex:
+    """few-shot 示例图片索引，特征保存在 NumPy 矩阵中，支持批量 top-k 余弦检索"""
+
+    def __init__(self, embeddings, image_paths, labels, source_paths=None):
+        self.embeddings = embeddings
+        self.image_paths = list(image_paths)
+        self.labels = list(labels)
+        # 建索引时目录下的全部图片（含被跳过的），用于判断索引是否过期
+        self.source_paths = list(source_paths) if source_paths is not None else self.image_paths
+
+    def __len__(self):
+        return len(self.image_paths)
+
+    @classmethod
+    def build(cls, exemplar_dir, num_workers=None):
+        """为目录下所有 png 图片建立索引，跳过无法读取的图片"""
+        source_paths = sorted(str(p) for p in Path(exemplar_dir).glob("*.png"))
+        embeddings, valid = compute_embeddings(source_paths, num_workers)
+        image_paths = [p for p, ok in zip(source_paths, valid) if ok]
+        return cls(embeddings[valid], image_paths, [get_label(p) for p in image_paths], source_paths)
+
+    def save(self, index_file):
+        """保存索引到 .npz 文件"""
+        # 传入文件对象，避免 numpy 自动追加 .npz 后缀
+        with open(index_file, "wb") as f:
+            np.savez(
+                f,
+                embeddings=self.embeddings,
+                image_paths=np.array(self.image_paths),
+                labels=np.array(self.labels),
+                signature=_file_signature(self.source_paths),
+                feature_version=FEATURE_VERSION
+            )
+
+    @classmethod
+    def load(cls, index_file):
+        """从 .npz 文件加载索引"""
+        with np.load(index_file) as data:
+            return cls(data["embeddings"], data["image_paths"].tolist(), data["labels"].tolist())
+
+    @classmethod
+    def load_or_build(cls, exemplar_dir, index_file, num_workers=None):
+        """索引文件存在且与目录内容一致时直接加载，否则重建并保存"""
+        image_paths = sorted(str(p) for p in Path(exemplar_dir).glob("*.png"))
+        if index_file and os.path.exists(index_file):
+            with np.load(index_file) as data:
+                # 缺少字段的旧索引或其他 .npz 文件按过期处理
+                is_current = (
+                    all(key in data.files for key in ("feature_version", "signature"))
+                    and int(data["feature_version"]) == FEATURE_VERSION
+                    and data["signature"].tolist() == _file_signature(image_paths).tolist()
+                )
+            if is_current:
+                print(f"已加载示例索引: {index_file}")
+                return cls.load(index_file)
+
+        index = cls.build(exemplar_dir, num_workers)
+        if index_file:
+            index.save(index_file)
+            print(f"示例索引已保存至: {index_file}")
+        return index
+
+    def search(self, query_embeddings, k, batch_size=1024):
+        """批量 top-k 余弦检索
+        Args:
+            query_embeddings: (N, D) 已归一化的查询特征
+            k: 每个查询返回的示例数量
+            batch_size: 每批计算的查询数量，控制相似度矩阵的内存占用
+        Returns:
+            (indices, scores)，形状均为 (N, k)，按相似度从高到低排列
+        """
+        k = min(k, len(self))
+        num_queries = len(query_embeddings)
+        indices = np.zeros((num_queries, k), dtype=np.int64)
+        scores = np.zeros((num_queries, k), dtype=np.float32)
+        if k == 0:
+            return indices, scores
+
+        for start in range(0, num_queries, batch_size):
+            # 特征已归一化，矩阵乘法即余弦相似度
+            similarity = query_embeddings[start:start + batch_size] @ self.embeddings.T
+            top = np.argpartition(-similarity, k - 1, axis=1)[:, :k]
+            top_scores = np.take_along_axis(similarity, top, axis=1)
+            order = np.argsort(-top_scores, axis=1)
+            indices[start:start + batch_size] = np.take_along_axis(top, order, axis=1)
+            scores[start:start + batch_size] = np.take_along_axis(top_scores, order, axis=1)
+
+        return indices, scores
+
+    def retrieve(self, query_paths, k, num_workers=None):
+        """为每张查询图片返回最相似的 k 个示例，自动跳过与查询同名的图片，无法读取的查询图片返回空列表
+        Returns:
+            {查询图片路径: [{"image_path", "label", "score"}, ...]}
+        """
+        query_paths = [str(p) for p in query_paths]
+        query_embeddings, valid = compute_embeddings(query_paths, num_workers)
+        # 多取一个，以便去掉与查询同名的示例后仍有 k 个
+        indices, scores = self.search(query_embeddings, k + 1)
+
+        exemplars = {}
+        for query_path, ok, row_indices, row_scores in zip(query_paths, valid, indices, scores):
+            # 无法读取的查询图片不附带示例
+            if not ok:
+                exemplars[query_path] = []
+                continue
+            query_name = Path(query_path).name
+            exemplars[query_path] = [
+                {
+                    "image_path": self.image_paths[i],
+                    "label": self.labels[i],
+                    "score": float(score)
+                }
+                for i, score in zip(row_indices, row_scores)
+                if Path(self.image_paths[i]).name != query_name
+            ][:k]
+        return exemplars
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Build the few-shot exemplar index for evaluation')
+    parser.add_argument('--exemplar_dir', type=str, required=True,
+                      help='Directory containing the labelled few-shot images')
+    parser.add_argument('--index_file', type=str, default=None,
+                      help='Path of the output .npz index file (default: few_shot_index.npz next to exemplar_dir)')
+    parser.add_argument('--num_workers', type=int, default=None,
+                      help='Number of worker processes (default: CPU count)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+    index_file = args.index_file or default_index_file(args.exemplar_dir)
+    index = ExemplarIndex.build(args.exemplar_dir, args.num_workers)
+    index.save(index_file)
+
+    print(f"示例索引已保存至: {index_file}")
+    print(f"示例数量: {len(index)}")
+    print(f"normal: {index.labels.count('normal')}  diseased: {index.labels.count('diseased')}")
+
+if __name__ == "__main__":
+    main()
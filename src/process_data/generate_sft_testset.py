@@ -73,7 +73,16 @@ def create_json_entry(image_path):
         "images": [image_path]
     }
 
-def generate_balanced_dataset(image_dir):
+def load_exclude_list(exclude_file):
+    # 读取预检脚本生成的排除列表，每行一个文件名
+    if not exclude_file:
+        return set()
+    with open(exclude_file, "r", encoding="utf-8") as f:
+        return {line.strip() for line in f if line.strip()}
+
+def generate_balanced_dataset(image_dir, exclude_file=None):
+    excluded = load_exclude_list(exclude_file)
+    
     # 用于存储不同类别的图片路径
     categorized_images = {
         'sick': [],
@@ -82,6 +91,8 @@ def generate_balanced_dataset(image_dir):
     
     # 遍历并分类图片
     for image_path in Path(image_dir).glob("*.png"):
+        if image_path.name in excluded:
+            continue
         if "-P0" in str(image_path):
             categorized_images['healthy'].append(str(image_path))
         else:
@@ -116,6 +127,8 @@ def parse_args():
                       help='Directory to save the output JSON file')
     parser.add_argument('--output_name', type=str, default='balanced_thyroid_dataset.json',
                       help='Name of the output JSON file')
+    parser.add_argument('--exclude_file', type=str, default=None,
+                      help='Exclusion list written by preflight_check.py')
     return parser.parse_args()
 
 def main():
@@ -126,7 +139,7 @@ def main():
     os.makedirs(args.output_dir, exist_ok=True)
     
     # 生成平衡数据集
-    dataset, samples_per_class = generate_balanced_dataset(args.image_dir)
+    dataset, samples_per_class = generate_balanced_dataset(args.image_dir, args.exclude_file)
     
     # 构建输出文件的完整路径
     output_file = os.path.join(args.output_dir, args.output_name)
@@ -0,0 +1,205 @@
+# python preflight_check.py \
+# --image_dir /root/thyroid/data/data/trainset \
+# --output_dir /root/thyroid/data/preflight \
+# --num_workers 16 \
+# --full_decode
+#
+# 在生成数据集和评估之前运行，生成的 exclude_list.txt 可通过
+# --exclude_file 传给 generate_*.py 脚本
+
+import json
+import os
+from pathlib import Path
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+import argparse
+
+from PIL import Image
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# PNG IHDR 中的颜色类型
+PNG_COLOR_TYPES = {
+    0: 'grayscale',
+    2: 'rgb',
+    3: 'palette',
+    4: 'grayscale_alpha',
+    6: 'rgba'
+}
+
+def get_category(image_path):
+    # 与数据集生成脚本保持一致的类别划分
+    return 'healthy' if "-P0" in str(image_path) else 'sick'
+
+def read_png_header(image_path):
+    """从 IHDR 读取文件本身的位深和颜色类型（Pillow 的 mode 会把 16 位、低位深图片转换掉）"""
+    with open(image_path, "rb") as f:
+        header = f.read(26)
+    if len(header) < 26 or header[:8] != PNG_SIGNATURE or header[12:16] != b"IHDR":
+        raise ValueError("Missing PNG signature or IHDR chunk")
+    return header[24], PNG_COLOR_TYPES.get(header[25], str(header[25]))
+
+def check_image(image_path, full_decode=False):
+    """检查单张图片是否损坏，并读取尺寸、位深和文件大小"""
+    result = {
+        "image_path": str(image_path),
+        "category": get_category(image_path),
+        "ok": False,
+        "reason": None,
+        "file_size": 0,
+        "width": None,
+        "height": None,
+        "mode": None,
+        "bit_depth": None,
+        "color_type": None
+    }
+
+    try:
+        result["file_size"] = os.path.getsize(image_path)
+        if result["file_size"] == 0:
+            result["reason"] = "zero-byte file"
+            return result
+
+        result["bit_depth"], result["color_type"] = read_png_header(image_path)
+
+        # verify() 会读取整个文件并校验 PNG 各数据块的 CRC，但不解码像素
+        with Image.open(image_path) as img:
+            img.verify()
+
+        # verify() 之后图片对象不可再用，需要重新打开
+        with Image.open(image_path) as img:
+            result["width"], result["height"] = img.size
+            result["mode"] = img.mode
+            # 完整解码像素，可以发现压缩数据本身的错误
+            if full_decode:
+                img.load()
+
+        result["ok"] = True
+    except Exception as e:
+        result["reason"] = f"{type(e).__name__}: {e}"
+
+    return result
+
+def _check_image_task(args):
+    return check_image(*args)
+
+def scan_images(image_dir, num_workers=None, full_decode=False):
+    """使用进程池并行检查目录下所有图片"""
+    image_paths = sorted(Path(image_dir).glob("*.png"))
+    tasks = [(str(image_path), full_decode) for image_path in image_paths]
+
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        # 分块提交以减少进程间通信开销
+        chunksize = max(1, len(tasks) // ((num_workers or os.cpu_count() or 1) * 4))
+        results = list(executor.map(_check_image_task, tasks, chunksize=chunksize))
+
+    return results
+
+def _summarize(values):
+    if not values:
+        return None
+    values = sorted(values)
+    return {
+        "min": values[0],
+        "max": values[-1],
+        "mean": sum(values) / len(values),
+        "median": values[len(values) // 2]
+    }
+
+def collect_statistics(results):
+    """按类别统计尺寸、位深和文件大小的分布"""
+    grouped = defaultdict(list)
+    for result in results:
+        grouped[result["category"]].append(result)
+
+    statistics = {}
+    for category, items in grouped.items():
+        valid = [item for item in items if item["ok"]]
+        dimensions = defaultdict(int)
+        bit_depths = defaultdict(int)
+        color_types = defaultdict(int)
+        modes = defaultdict(int)
+        for item in valid:
+            dimensions[f"{item['width']}x{item['height']}"] += 1
+            bit_depths[str(item["bit_depth"])] += 1
+            color_types[item["color_type"]] += 1
+            modes[item["mode"]] += 1
+
+        statistics[category] = {
+            "total": len(items),
+            "valid": len(valid),
+            "corrupt": len(items) - len(valid),
+            "dimensions": dict(sorted(dimensions.items(), key=lambda x: -x[1])),
+            "bit_depth": dict(bit_depths),
+            "color_type": dict(color_types),
+            "mode": dict(modes),
+            "width": _summarize([item["width"] for item in valid]),
+            "height": _summarize([item["height"] for item in valid]),
+            "file_size": _summarize([item["file_size"] for item in valid])
+        }
+
+    return statistics
+
+def parse_args():
+    parser = argparse.ArgumentParser(description='Preflight integrity and statistics scan for thyroid images')
+    parser.add_argument('--image_dir', type=str, required=True,
+                      help='Directory containing the thyroid images')
+    parser.add_argument('--output_dir', type=str, required=True,
+                      help='Directory to save the report and exclusion list')
+    parser.add_argument('--report_name', type=str, default='preflight_report.json',
+                      help='Name of the output report JSON file')
+    parser.add_argument('--exclude_name', type=str, default='exclude_list.txt',
+                      help='Name of the output exclusion list file')
+    parser.add_argument('--num_workers', type=int, default=None,
+                      help='Number of worker processes (default: CPU count)')
+    parser.add_argument('--full_decode', action='store_true',
+                      help='Also decode pixel data (default pass only verifies chunk structure and CRCs)')
+    return parser.parse_args()
+
+def main():
+    args = parse_args()
+
+    # 创建输出目录
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # 并行检查所有图片
+    results = scan_images(args.image_dir, args.num_workers, args.full_decode)
+    statistics = collect_statistics(results)
+    bad_images = [result for result in results if not result["ok"]]
+
+    # 保存检查报告
+    report_file = os.path.join(args.output_dir, args.report_name)
+    with open(report_file, "w", encoding="utf-8") as f:
+        json.dump({
+            "image_dir": args.image_dir,
+            "full_decode": args.full_decode,
+            "statistics": statistics,
+            "excluded": [
+                {"image_path": item["image_path"], "reason": item["reason"]}
+                for item in bad_images
+            ]
+        }, f, ensure_ascii=False, indent=2)
+
+    # 保存排除列表，每行一个文件名
+    exclude_file = os.path.join(args.output_dir, args.exclude_name)
+    with open(exclude_file, "w", encoding="utf-8") as f:
+        for item in bad_images:
+            f.write(Path(item["image_path"]).name + "\n")
+
+    # 打印统计信息
+    print(f"检查报告已保存至: {report_file}")
+    print(f"排除列表已保存至: {exclude_file}")
+    print(f"图片总数: {len(results)}")
+    print(f"损坏图片数量: {len(bad_images)}")
+    for item in bad_images:
+        print(f"  {item['image_path']}: {item['reason']}")
+    for category, stats in statistics.items():
+        print(f"\n{category}: {stats['valid']}/{stats['total']} 张有效")
+        print(f"尺寸分布: {stats['dimensions']}")
+        print(f"位深分布: {stats['bit_depth']}")
+        print(f"颜色类型分布: {stats['color_type']}")
+        if stats['file_size']:
+            print(f"文件大小: {stats['file_size']}")
+
+if __name__ == "__main__":
+    main()